@@ -1,31 +1,33 @@
-import argparse
 import os
 from pathlib import Path
 import subprocess
 from typing import TYPE_CHECKING
 
 
-from karppipeline.util.terminal import bold, green_box, red_box
-
-
 if TYPE_CHECKING:
+    import argparse
+
     from karppipeline.config import ConfigHandle
 
 
-def clean(configs: list["ConfigHandle"]) -> None:
+def clean(workdirs: list[Path]) -> None:
+    """
+    remove log and output directories for the given resource directories
+    """
     import shutil
-    import os
     from karppipeline.common import get_log_dir, get_output_dir
 
-    """
-    remove log and output directories for the given resources
-    """
-    for resource in configs:
-        clean_paths = get_log_dir(resource.workdir), get_output_dir(resource.workdir)
-        for path in clean_paths:
-            if os.path.exists(path):
-                print(f"Remove {path}")
+    for workdir in workdirs:
+        # one listing per resource, DirEntry knows the file type without an extra stat
+        try:
+            with os.scandir(workdir) as entries:
+                dirs = {entry.name for entry in entries if entry.is_dir(follow_symlinks=False)}
+        except FileNotFoundError:
+            continue
+        for path in get_log_dir(workdir), get_output_dir(workdir):
+            if path.name in dirs:
                 shutil.rmtree(path)
+                print(f"Remove {path}")
 
 
 def print_config_tree(configs: list["ConfigHandle"]) -> None:
@@ -62,11 +64,15 @@ def print_config(configs: list["ConfigHandle"], resource_id: str | None = None)
         print(json.dumps(config.config_dict, pretty=True))
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args() -> "argparse.Namespace":
     """
     Defines the pipeline CLI input, writes any requested help text and parses the input.
     Exits if --help was invoked.
     """
+    import argparse
+
+    from karppipeline.util.terminal import bold
+
     parser = argparse.ArgumentParser(
         prog="karp-pipeline",
         # TODO I haven't figured out a way to make Argparse both respect newlines AND not do breaks inside words
@@ -87,12 +93,28 @@ def parse_args() -> argparse.Namespace:
     subparsers = parser.add_subparsers(dest="command", required=True, metavar="")
     subparsers.metavar = "COMMAND"
 
-    subparsers.add_parser("clean", help="remove genereated files")
+    def add_cache_param(p: argparse.ArgumentParser):
+        p.add_argument(
+            "--no-cache",
+            help="Find the configs again instead of using the result cached by a previous invocation.",
+            action="store_false",
+            dest="use_cache",
+        )
 
-    subparsers.add_parser(
+    p_clean = subparsers.add_parser("clean", help="remove genereated files")
+    p_clean.add_argument(
+        "--here",
+        help="Only clean the current directory, without looking for parent and child configs.",
+        action="store_true",
+        default=False,
+    )
+    add_cache_param(p_clean)
+
+    p_print_config_tree = subparsers.add_parser(
         "print-config-tree",
         help="helper to see the configuration hierarchy (using inheritance via structure and root-param or parent-param)",
     )
+    add_cache_param(p_print_config_tree)
 
     # TODO reimplement as module
     p_print_config = subparsers.add_parser(
@@ -100,6 +122,7 @@ def parse_args() -> argparse.Namespace:
         help="helper to see the configuration",
     )
     p_print_config.add_argument("resource_id", nargs="?")
+    add_cache_param(p_print_config)
 
     def add_output_params(p: argparse.ArgumentParser):
         group = p.add_mutually_exclusive_group()
@@ -146,6 +169,21 @@ def parse_args() -> argparse.Namespace:
     )
     add_modules(p_run)
     add_output_params(p_run)
+    add_cache_param(p_run)
+
+    def positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+        return number
+
+    p_run.add_argument(
+        "--jobs",
+        default=1,
+        type=positive_int,
+        help="Number of resources to process in parallel when the output is compact (default: 1). "
+        "install and uninstall always process one resource at a time.",
+    )
 
     p_install = subparsers.add_parser(
         "install",
@@ -154,6 +192,7 @@ def parse_args() -> argparse.Namespace:
     )
     add_modules(p_install)
     add_output_params(p_install)
+    add_cache_param(p_install)
 
     p_uninstall = subparsers.add_parser(
         "uninstall",
@@ -162,30 +201,113 @@ def parse_args() -> argparse.Namespace:
     )
     add_modules(p_uninstall)
     add_output_params(p_uninstall)
+    add_cache_param(p_uninstall)
 
     return parser.parse_args()
 
 
+def execute_resource(
+    command: str,
+    config_handle: "ConfigHandle",
+    kwargs: dict[str, object],
+    log_level: str,
+    compact_output: bool,
+    json_output: bool,
+) -> bool:
+    """
+    Runs, installs or uninstalls a single resource and returns True if it succeeded. Errors are
+    logged, not raised. Defined on module level so that it can be used in worker processes.
+    """
+    import logging
+    import karppipeline.logging as karps_logging
+    from karppipeline.common import PipelineException
+    from karppipeline.config import load_config
+
+    # only import the execution code needed for the given command
+    if command == "run":
+        from karppipeline.execution.run import run as execute
+    elif command == "install":
+        from karppipeline.execution.install import install as execute
+    else:
+        from karppipeline.execution.install import uninstall as execute
+
+    karps_logging.setup_resource_logging(
+        config_handle.workdir, log_level, compact_output=compact_output, json_output=json_output
+    )
+    logger = logging.getLogger(__name__)
+    try:
+        # karps_logging.logger is the "karppipeline" logger that was just configured
+        for warning in config_handle.warnings:
+            karps_logging.logger.warning(warning)
+
+        config = load_config(config_handle)
+        # run calls importers and exporters
+        if not compact_output:
+            if command == "run":
+                task_output = "Running "
+            elif command == "install":
+                task_output = "Installing "
+            elif command == "uninstall":
+                task_output = "Uninstalling "
+            else:
+                task_output = "Unknown action "
+
+            # only ask git for the version if it is going to be logged
+            if logger.isEnabledFor(logging.INFO):
+                # by using a reference to this file, find the root dir, first parent is karppipeline, second src dir, third root dir
+                pipeline_code_dir = Path(__file__).resolve().parent.parent.parent
+
+                p = subprocess.run(
+                    ["git", "rev-parse", "--short", "HEAD"],
+                    capture_output=True,
+                    encoding="utf-8",
+                    cwd=pipeline_code_dir,
+                )
+                logger.info("karp-pipeline version: commit %s", p.stdout.strip())
+
+            logger.info("%s%s", task_output, config.resource_id)
+        execute(config, **kwargs)
+    except Exception as e:
+        if isinstance(e, PipelineException):
+            logger.error("Exception for resource: %s", e.args[0])
+        else:
+            logger.error("Exception for resource", exc_info=True)
+        return False
+    finally:
+        # make sure that everything is written to the log file before the result is reported
+        karps_logging.stop_resource_logging()
+    return True
+
+
 def cli():
     args = parse_args()
 
     # If help was invoked, parse_args will exit. Imports go after parse_args so that help is generated as fast as possible
     import logging
-    from karppipeline.config import find_configs, load_config
-    from karppipeline.execution.install import install, uninstall
-    from karppipeline.execution.run import run
-    import karppipeline.logging as karps_logging
-    from karppipeline.common import PipelineException
 
     logger = logging.getLogger(__name__)
+
+    if args.command == "clean" and args.here:
+        # does not need any configs, skip discovery, but refuse to remove anything outside of a resource
+        workdir = Path.cwd()
+        if not (workdir / "config.yaml").exists():
+            logger.error("Exception for resource: config: could not find a config in %s", workdir)
+            return 1
+        clean([workdir])
+        return 0
+
+    from karppipeline.config import find_configs
+    from karppipeline.common import PipelineException
+    from karppipeline.util.terminal import GREEN_BOX, RED_BOX
+
     try:
-        configs = find_configs()
+        configs = find_configs(use_cache=args.use_cache)
     except PipelineException as e:
-        logger.error(f"Exception for resource: {e.args[0]}")
+        logger.error("Exception for resource: %s", e.args[0])
         return 1
 
     if args.command == "clean":
-        clean(configs)
+        clean([config_handle.workdir for config_handle in configs])
         return 0
 
     if args.command == "print-config-tree":
@@ -196,10 +318,6 @@ def cli():
         print_config(configs, args.resource_id)
         return 0
 
-    do_run = args.command == "run"
-    do_install = args.command == "install"
-    do_uninstall = args.command == "uninstall"
-
     kwargs = {}
     if len(args.modules) > 0:
         kwargs["subcommand"] = args.modules
@@ -210,56 +328,51 @@ def cli():
             compact_output = True
     else:
         compact_output = args.compact_output == "compact"
-    for config_handle in configs:
-        karps_logging.setup_resource_logging(
-            config_handle.workdir, args.log_level, compact_output=compact_output, json_output=args.json_output
-        )
-        resource_logger = logging.getLogger("karppipeline")
-        for warning in config_handle.warnings:
-            resource_logger.warning(warning)
 
-        try:
-            config = load_config(config_handle)
-            # run calls importers and exporters
-            if not compact_output:
-                if do_run:
-                    task_output = "Running "
-                elif do_install:
-                    task_output = "Installing "
-                elif do_uninstall:
-                    task_output = "Uninstalling "
+    def print_result(config_handle: "ConfigHandle", success: bool) -> None:
+        if success:
+            # TODO inform user if there was warnings
+            print(f"{GREEN_BOX} {config_handle.config_dict['resource_id']}\t success")
+        else:
+            print(f"{RED_BOX} {config_handle.workdir}\t fail")
+
+    # only run may be parallel, installers can share state between resources, such as the sbxrepo metadata repository
+    jobs = args.jobs if args.command == "run" else 1
+    if compact_output and jobs > 1 and len(configs) > 1:
+        # each worker logs to the log file of its resource
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(len(configs), jobs)) as executor:
+            futures = [
+                executor.submit(
+                    execute_resource,
+                    args.command,
+                    config_handle,
+                    kwargs,
+                    args.log_level,
+                    compact_output,
+                    args.json_output,
+                )
+                for config_handle in configs
+            ]
+            # print in the same order as the resources were found
+            for config_handle, future in zip(configs, futures):
+                # execute_resource handles its own errors, this is an error in the setup or a worker that died
+                if exception := future.exception():
+                    logger.error("Exception for resource: %s", config_handle.workdir, exc_info=exception)
+                    success = False
                 else:
-                    task_output = "Unknown action "
-
-                # by using a reference to this file, find the root dir, first parent is karppipeline, second src dir, third root dir
-                pipeline_code_dir = Path(__file__).resolve().parent.parent.parent
+                    success = future.result()
+                print_result(config_handle, success)
+        return 0
 
-                p = subprocess.run(
-                    ["git", "rev-parse", "--short", "HEAD"],
-                    capture_output=True,
-                    encoding="utf-8",
-                    cwd=pipeline_code_dir,
-                )
-                logger.info(f"karp-pipeline version: commit {p.stdout.strip()}")
-
-                logger.info(task_output + config.resource_id)
-            if do_install:
-                install(config, **kwargs)
-            if do_uninstall:
-                uninstall(config, **kwargs)
-            elif do_run:
-                run(config, **kwargs)
-            if compact_output:
-                # TODO inform user if there was warnings
-                print(f"{green_box()} {config.resource_id}\t success")
-        except Exception as e:
-            if isinstance(e, PipelineException):
-                logger.error(f"Exception for resource: {e.args[0]}")
-            else:
-                logger.error("Exception for resource", exc_info=True)
-            if compact_output:
-                print(f"{red_box()} {config_handle.workdir}\t fail")
-            else:
-                return 1
+    for config_handle in configs:
+        success = execute_resource(
+            args.command, config_handle, kwargs, args.log_level, compact_output, args.json_output
+        )
+        if compact_output:
+            print_result(config_handle, success)
+        elif not success:
+            return 1
 
     return 0
@@ -1,9 +1,12 @@
 import copy
 from dataclasses import dataclass, field
 import functools
+import hashlib
 import logging
 import os
 from pathlib import Path
+import pickle
+import tempfile
 from typing import Any, Iterator, cast
 
 from yaml import YAMLError
@@ -33,11 +36,88 @@ def load_config(config_handle, ignore_validation=False) -> PipelineConfig:
         return PipelineConfig.model_validate(config_dict)
 
 
-def find_configs() -> list[ConfigHandle]:
-    return list(_find_configs())
+# bump when the discovery or merge logic changes so that old caches are ignored
+_CACHE_VERSION = 2
 
+type _Signature = tuple[int, int] | None
 
-def _find_configs() -> Iterator[ConfigHandle]:
+
+class _WarningCollector(logging.Filter):
+    """
+    Collects the warnings logged during discovery, so that they can be logged again when the cache is used.
+    A filter instead of a handler, so that the records are still passed on to the configured handlers
+    (or logging.lastResort).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            self.messages.append(record.getMessage())
+        return True
+
+
+def find_configs(use_cache: bool = False) -> list[ConfigHandle]:
+    """
+    If use_cache is set, the result is stored in the user's cache directory together with
+    the modification times of every config.yaml and directory that was looked at. The
+    cached configs are used as long as none of those have changed.
+    """
+    if not use_cache:
+        return list(_find_configs())
+
+    cache_file = _get_cache_file(Path(os.getcwd()))
+    try:
+        with open(cache_file, "rb") as fp:
+            version, cached_watched, cached_warnings, cached_configs = pickle.load(fp)
+        if version == _CACHE_VERSION and all(_signature(Path(path)) == sig for path, sig in cached_watched.items()):
+            for message in cached_warnings:
+                logger.warning(message)
+            return cached_configs
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+        # missing, corrupt or incompatible cache, rediscover
+        pass
+
+    watched: dict[str, _Signature] = {}
+    warning_collector = _WarningCollector()
+    logger.addFilter(warning_collector)
+    try:
+        configs = list(_find_configs(watched))
+    finally:
+        logger.removeFilter(warning_collector)
+
+    tmp_file = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file and replace, so that concurrent runs never read a partially written cache
+        with tempfile.NamedTemporaryFile("wb", dir=cache_file.parent, suffix=".tmp", delete=False) as fp:
+            tmp_file = fp.name
+            pickle.dump((_CACHE_VERSION, watched, warning_collector.messages, configs), fp)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        logger.debug(f"Could not write config cache: {cache_file}", exc_info=True)
+        if tmp_file:
+            Path(tmp_file).unlink(missing_ok=True)
+    return configs
+
+
+def _get_cache_file(start_path: Path) -> Path:
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    key = hashlib.sha1(str(start_path).encode()).hexdigest()
+    return cache_home / "karp-pipeline" / f"configs-{key}.pickle"
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _find_configs(watched: dict[str, _Signature] | None = None) -> Iterator[ConfigHandle]:
     """
     Find all available resource configs in $CWD or below in the hierarchy.
     Resolves parent resources by looking for the parent-setting or looking
@@ -48,12 +128,18 @@ def _find_configs() -> Iterator[ConfigHandle]:
     - use parent_config_paths for more than debugging, which will make sure
       that the paths printed by karp-pipeline print-config-tree will be the
       ones that are used. Collect the paths and merge based on those paths later.
+
+    The signature of every config.yaml (existing or not) and directory that is
+    looked at is added to watched.
     """
+    if watched is None:
+        watched = {}
 
     @functools.lru_cache
     def read_config(dir_path: Path) -> Map | None:
         config_path = dir_path / "config.yaml"
-        if config_path.exists():
+        watched[str(config_path)] = _signature(config_path)
+        if watched[str(config_path)] is not None:
             with open(config_path) as fp:
                 logger.info(f"Reading {config_path}")
                 try:
@@ -111,34 +197,38 @@ def _find_configs() -> Iterator[ConfigHandle]:
     ) -> list[tuple[dict[str, Any], list[Path], list[str]]]:
         children = []
         warnings = []
-        for dir in path.iterdir():
-            if dir.is_dir():
-                config = read_config(dir)
-                if config:
-                    if "parent" in config:
-                        parent_path = Path(cast(str, config["parent"])).parent
-                        if not parent_path.is_absolute():
-                            parent_path = dir / parent_path
-                        parent_config_paths = [parent_path]
-                        other_parent = read_config(parent_path)
-                        if not other_parent:
-                            raise PipelineException(f"config: could not find parent ({path})")
-                        if "parent" in other_parent:
-                            warnings.append(
-                                "A parent config contains `parent`-key which is not supported and will be ignored."
-                            )
-                        new_config = _merge_configs(other_parent, config)
-                    else:
-                        new_config = _merge_configs(parent, config)
-                    new_children = find_children(dir, new_config, parent_config_paths + [dir])
-                    if new_children:
-                        for child in new_children:
-                            child[2].extend(warnings)
-                            children.append(child)
-                    else:
-                        # insert workdir so we can find the correct place later
-                        new_config["workdir"] = dir
-                        children.append((new_config, parent_config_paths + [dir], warnings))
+        # new directories change the modification time of path
+        watched[str(path)] = _signature(path)
+        with os.scandir(path) as entries:
+            # DirEntry.is_dir uses the file type from the directory listing instead of a stat per entry
+            subdirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+        for dir in subdirs:
+            config = read_config(dir)
+            if config:
+                if "parent" in config:
+                    parent_path = Path(cast(str, config["parent"])).parent
+                    if not parent_path.is_absolute():
+                        parent_path = dir / parent_path
+                    parent_config_paths = [parent_path]
+                    other_parent = read_config(parent_path)
+                    if not other_parent:
+                        raise PipelineException(f"config: could not find parent ({path})")
+                    if "parent" in other_parent:
+                        warnings.append(
+                            "A parent config contains `parent`-key which is not supported and will be ignored."
+                        )
+                    new_config = _merge_configs(other_parent, config)
+                else:
+                    new_config = _merge_configs(parent, config)
+                new_children = find_children(dir, new_config, parent_config_paths + [dir])
+                if new_children:
+                    for child in new_children:
+                        child[2].extend(warnings)
+                        children.append(child)
+                else:
+                    # insert workdir so we can find the correct place later
+                    new_config["workdir"] = dir
+                    children.append((new_config, parent_config_paths + [dir], warnings))
         return children
 
     children = find_children(start_path, current_dir_config, parent_config_paths)
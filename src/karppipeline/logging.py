@@ -1,21 +1,67 @@
-from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import math
 from pathlib import Path
+import queue
 import sys
+import time
 
 from karppipeline.common import create_log_dir
+from karppipeline.util import json
 
 
 logger = logging.getLogger("karppipeline")
 
 
-def format(date) -> str:
-    return date.strftime("%Y-%m-%d %H:%M:%S,%f")
+def format_timestamp(timestamp: float) -> str:
+    """
+    formats a POSIX timestamp as "%Y-%m-%d %H:%M:%S,%f" in local time, without creating a datetime object
+    """
+    fraction, seconds = math.modf(timestamp)
+    microseconds = round(fraction * 1_000_000)
+    if microseconds >= 1_000_000:
+        seconds += 1
+        microseconds -= 1_000_000
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))},{microseconds:06d}"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "timestamp": format_timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload)
+
+
+# formatters are stateless, so the same one can be used for all resources
+_json_formatter = JsonFormatter()
+
+# (log_level, json_output) of the current console handler, None when logging to file
+_console_settings: tuple[str, bool] | None = None
+
+# writes the log records of the current resource to its log file in a background thread
+_listener: QueueListener | None = None
 
 
 def setup_resource_logging(path: Path, log_level: str, compact_output: bool = False, json_output: bool = False):
-    # remove previous handlers
-    logger.handlers.clear()
+    global _console_settings, _listener
+
+    stop_resource_logging()
+
+    # console output does not depend on the resource, keep the handler if the settings are the same
+    if not compact_output and _console_settings == (log_level, json_output) and logger.handlers:
+        return
+    _console_settings = None if compact_output else (log_level, json_output)
+
+    # remove previous handlers, closing the file of the previous resource
+    for previous_handler in list(logger.handlers):
+        logger.removeHandler(previous_handler)
+        previous_handler.close()
 
     logger.setLevel("INFO")
 
@@ -24,31 +70,20 @@ def setup_resource_logging(path: Path, log_level: str, compact_output: bool = Fa
         # create log file for resource if it does not exist
         log_dir = create_log_dir(path)
         log_file = log_dir / "run.log"
-        # write header to know if a new run has started
-        with open(log_file, "a") as f:
-            f.write("-------------------------------\n")
-            f.write(f"pipeline run, {format(datetime.now())}\n")
-        handler = logging.FileHandler(log_file)
+        file_handler = logging.FileHandler(log_file, mode="a")
+        # write header to know if a new run has started, using the handler's stream to avoid opening the file twice
+        file_handler.stream.write(f"-------------------------------\npipeline run, {format_timestamp(time.time())}\n")
+        # the records are formatted by the QueueHandler and written to file by the listener's thread,
+        # so that logging does not wait for disk I/O
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, file_handler)
+        _listener.start()
+        handler = QueueHandler(log_queue)
     else:
         handler = logging.StreamHandler(stream=sys.stdout)
 
     if json_output:
-        import json
-
-        class JsonFormatter(logging.Formatter):
-            def format(self, record):
-                payload = {
-                    "timestamp": format(datetime.fromtimestamp(record.created)),
-                    "level": record.levelname,
-                    "logger": record.name,
-                    "message": record.getMessage(),
-                }
-                if record.exc_info:
-                    payload["exc_info"] = self.formatException(record.exc_info)
-                return json.dumps(payload)
-
-        formatter = JsonFormatter()
-        handler.setFormatter(formatter)
+        handler.setFormatter(_json_formatter)
 
     resolved_level = getattr(logging, log_level)
     logger.setLevel(resolved_level)
@@ -57,6 +92,23 @@ def setup_resource_logging(path: Path, log_level: str, compact_output: bool = Fa
     logger.addHandler(handler)
 
 
+def stop_resource_logging():
+    """
+    Writes any queued log records to the resource's log file and closes it. Console logging is kept.
+    """
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+
+
 def get_logger(name, prefix):
     class PrefixFilter(logging.Filter):
         def __init__(self, prefix: str):
@@ -124,7 +124,7 @@ def create_karps_sql(
                     return "NULL"
                 elif isinstance(val, str):
                     return format_str(val)
-                elif isinstance(val, int) or isinstance(val, float):
+                elif isinstance(val, (int, float)):
                     return str(val)
                 elif isinstance(val, dict):
                     return ",".join([format_value(v) for v in val.values()])
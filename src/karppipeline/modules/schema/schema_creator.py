@@ -78,7 +78,7 @@ def _check_or_create_field(pipeline_config: PipelineConfig, schema, key, values)
             # at this point, inner_value must be scalar otherwise the source file's entry schema is not supported
             if inner_value is None:
                 break
-            if isinstance(inner_value, list) or isinstance(inner_value, dict):
+            if isinstance(inner_value, (list, dict)):
                 raise PipelineException("Level of nesting not allowed.")
             if inner_field:
                 _check_type(inner_key, inner_field, inner_value)
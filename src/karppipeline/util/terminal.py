@@ -1,3 +1,5 @@
+import functools
+
 styles_map = {"plain": "0", "bright": "1", "redbg": "41", "greenbg": "42"}
 
 ansi_esc = "\x1b"
@@ -8,17 +10,14 @@ def fmt(*styles: str) -> str:
     return f"{ansi_esc}[{res}m"
 
 
+@functools.lru_cache
 def bold(text: str) -> str:
     return f"{fmt('bright')}{text}{fmt('plain')}"
 
 
-def green_box() -> str:
-    return color_box("green")
-
-
-def red_box() -> str:
-    return color_box("red")
-
-
 def color_box(color) -> str:
     return f"{fmt(f'{color}bg')}  {fmt('plain')}"
+
+
+GREEN_BOX = color_box("green")
+RED_BOX = color_box("red")
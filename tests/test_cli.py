@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+
+from karppipeline.cli import cli
+
+
+def create_resources(path, resource_ids):
+    path.mkdir()
+    (path / "config.yaml").write_text("export:\n  default: [jsonl]\nfields: []\n")
+    for resource_id in resource_ids:
+        (path / resource_id / "source").mkdir(parents=True)
+        (path / resource_id / "config.yaml").write_text(f"resource_id: {resource_id}\n")
+        (path / resource_id / "source" / "data.jsonl").write_text('{"word": "ord", "pos": "nn"}\n')
+
+
+def test_run_parallel(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    create_resources(tmp_path / "resources", ["res1", "res2"])
+    monkeypatch.chdir(tmp_path / "resources")
+    monkeypatch.setattr(sys, "argv", ["karp-pipeline", "run", "--jobs", "2"])
+
+    assert cli() == 0
+
+    output = capsys.readouterr().out.splitlines()
+    assert sorted(line.split()[-2:] for line in output) == [["res1", "success"], ["res2", "success"]]
+    for resource_id in ("res1", "res2"):
+        output_file = tmp_path / "resources" / resource_id / "output" / f"{resource_id}.jsonl"
+        assert output_file.read_text() == '{"word":"ord","pos":"nn"}\n'
+
+
+def test_run_parallel_setup_error(tmp_path, monkeypatch, capsys, caplog):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    create_resources(tmp_path / "resources", ["res1", "res2"])
+    # makes it impossible to create the log directory
+    (tmp_path / "resources" / "res2" / "log").write_text("")
+    monkeypatch.chdir(tmp_path / "resources")
+    monkeypatch.setattr(sys, "argv", ["karp-pipeline", "run", "--jobs", "2"])
+
+    assert cli() == 0
+
+    output = capsys.readouterr().out.splitlines()
+    results = {line.split()[-2]: line.split()[-1] for line in output}
+    assert results == {"res1": "success", str(tmp_path / "resources" / "res2"): "fail"}
+    [record] = [record for record in caplog.records if record.levelname == "ERROR"]
+    assert record.exc_info and isinstance(record.exc_info[1], FileExistsError)
+
+
+def test_run_jobs_must_be_positive(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["karp-pipeline", "run", "--jobs", "0"])
+
+    with pytest.raises(SystemExit) as e:
+        cli()
+
+    assert e.value.code == 2
+    assert "--jobs: must be at least 1" in capsys.readouterr().err
+
+
+def test_clean_here(tmp_path, monkeypatch, capsys):
+    create_resources(tmp_path / "resources", ["res1", "res2"])
+    for resource_id in ("res1", "res2"):
+        for dir in ("log", "output"):
+            (tmp_path / "resources" / resource_id / dir).mkdir()
+    monkeypatch.chdir(tmp_path / "resources" / "res1")
+    monkeypatch.setattr(sys, "argv", ["karp-pipeline", "clean", "--here"])
+
+    assert cli() == 0
+
+    assert sorted(path.name for path in (tmp_path / "resources" / "res1").iterdir()) == ["config.yaml", "source"]
+    # only the current directory is cleaned
+    assert (tmp_path / "resources" / "res2" / "log").exists()
+    assert (tmp_path / "resources" / "res2" / "output").exists()
+    assert capsys.readouterr().out.splitlines() == [
+        f"Remove {tmp_path / 'resources' / 'res1' / 'log'}",
+        f"Remove {tmp_path / 'resources' / 'res1' / 'output'}",
+    ]
+
+
+def test_clean_here_without_config(tmp_path, monkeypatch, caplog):
+    (tmp_path / "output").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["karp-pipeline", "clean", "--here"])
+
+    assert cli() == 1
+
+    assert (tmp_path / "output").exists()
+    assert "could not find a config" in caplog.text
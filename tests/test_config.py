@@ -1,5 +1,8 @@
+import logging
+import os
+
 from karppipeline.common import Map
-from karppipeline.config import _merge_configs
+from karppipeline.config import _merge_configs, find_configs
 
 
 def test_merge_simple():
@@ -44,3 +47,52 @@ def test_merge_fields():
     newconf: Map = _merge_configs(conf1, conf2)
 
     assert newconf == {"fields": [{"name": "field1"}, {"name": "field2"}], "inner": {"fields": ["saved"]}}
+
+
+def test_find_configs_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    resource_dir = tmp_path / "resources"
+    resource_dir.mkdir()
+    (resource_dir / "config.yaml").write_text("root: true\nresource_id: parent\n")
+    (resource_dir / "res1").mkdir()
+    (resource_dir / "res1" / "config.yaml").write_text("resource_id: res1\n")
+    monkeypatch.chdir(resource_dir)
+
+    def resource_ids():
+        return sorted(handle.config_dict["resource_id"] for handle in find_configs(use_cache=True))
+
+    assert resource_ids() == ["res1"]
+    assert list((tmp_path / "cache" / "karp-pipeline").iterdir())
+
+    # changed config
+    (resource_dir / "res1" / "config.yaml").write_text("resource_id: res1-renamed\n")
+    os.utime(resource_dir / "res1" / "config.yaml", ns=(0, 0))
+    assert resource_ids() == ["res1-renamed"]
+
+    # new child config in a directory that already existed
+    (resource_dir / "res2").mkdir()
+    assert resource_ids() == ["res1-renamed"]
+    (resource_dir / "res2" / "config.yaml").write_text("resource_id: res2\n")
+    assert resource_ids() == ["res1-renamed", "res2"]
+
+
+def test_find_configs_cache_warnings(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    resource_dir = tmp_path / "resources"
+    (resource_dir / "res1").mkdir(parents=True)
+    (resource_dir / "config.yaml").write_text("fields:\n  - name: word\n    type: text\n")
+    (resource_dir / "res1" / "config.yaml").write_text(
+        "resource_id: res1\nfields:\n  - name: word\n    type: integer\n"
+    )
+    monkeypatch.chdir(resource_dir)
+    # no handlers configured, like when the CLI finds the configs, so warnings are written by logging.lastResort
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
+    monkeypatch.setattr(logging.getLogger("karppipeline"), "handlers", [])
+
+    # without cache, with cache
+    for _ in range(2):
+        find_configs(use_cache=True)
+        assert capsys.readouterr().err.splitlines() == ["field word is redefined in child config"]
+
+    # the cache is written through a temporary file that is replaced
+    assert [path.suffix for path in (tmp_path / "cache" / "karp-pipeline").iterdir()] == [".pickle"]
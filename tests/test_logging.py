@@ -0,0 +1,78 @@
+from datetime import datetime
+import json
+import logging
+
+import pytest
+
+import karppipeline.logging as karps_logging
+from karppipeline.logging import JsonFormatter, format_timestamp, setup_resource_logging, stop_resource_logging
+
+
+@pytest.fixture(autouse=True)
+def reset_resource_logging():
+    """
+    setup_resource_logging changes process global state, restore it after each test
+    """
+    yield
+    stop_resource_logging()
+    resource_logger = logging.getLogger("karppipeline")
+    for handler in list(resource_logger.handlers):
+        resource_logger.removeHandler(handler)
+        handler.close()
+    resource_logger.setLevel(logging.NOTSET)
+    karps_logging._console_settings = None
+
+
+def test_format_timestamp():
+    for timestamp in (0.0, 1700000000.0, 1700000000.5, 1760536123.123456, 1997552832.6125445, 5.9999996):
+        assert format_timestamp(timestamp) == datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S,%f")
+
+
+def test_json_formatter():
+    record = logging.LogRecord("karppipeline.test", logging.WARNING, __file__, 1, "hello %s", ("world",), None)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload == {
+        "timestamp": format_timestamp(record.created),
+        "level": "WARNING",
+        "logger": "karppipeline.test",
+        "message": "hello world",
+    }
+
+
+def test_setup_resource_logging_compact(tmp_path):
+    for run in ("first", "second"):
+        setup_resource_logging(tmp_path, "INFO", compact_output=True)
+        logger = logging.getLogger("karppipeline.test")
+        logger.info(f"{run} run")
+        logger.debug("not logged")
+        stop_resource_logging()
+
+    lines = (tmp_path / "log" / "run.log").read_text().splitlines()
+    assert len(lines) == 6
+    assert lines[0] == lines[3] == "-------------------------------"
+    assert lines[1].startswith("pipeline run, ")
+    assert lines[2] == "first run"
+    assert lines[5] == "second run"
+
+
+def test_setup_resource_logging_console(tmp_path):
+    resource_logger = logging.getLogger("karppipeline")
+
+    setup_resource_logging(tmp_path / "res1", "INFO")
+    [handler] = resource_logger.handlers
+    setup_resource_logging(tmp_path / "res2", "INFO")
+    assert resource_logger.handlers == [handler]
+
+    setup_resource_logging(tmp_path / "res2", "INFO", json_output=True)
+    [json_handler] = resource_logger.handlers
+    assert json_handler is not handler
+    assert isinstance(json_handler.formatter, JsonFormatter)
+
+    # queued records are written to the log file when the next resource is set up
+    setup_resource_logging(tmp_path, "INFO", compact_output=True, json_output=True)
+    logging.getLogger("karppipeline.test").info("to file")
+    setup_resource_logging(tmp_path, "INFO")
+    last_line = (tmp_path / "log" / "run.log").read_text().splitlines()[-1]
+    assert json.loads(last_line)["message"] == "to file"